@@ -1,12 +1,35 @@
+import random
 import time
+import traceback
+from amqp.exceptions import RecoverableConnectionError as AMQPRecoverableConnectionError
+from celery.exceptions import TimeoutError as CeleryTimeoutError
 from celery.utils.log import get_task_logger
+from kombu.exceptions import OperationalError as KombuOperationalError
 logger = get_task_logger(__name__)
 
+# need to handle different exceptions from different brokers
+# (only amqp's recoverable connection errors, retrying e.g. NotAllowed or FrameError will never succeed)
+BROKER_CONNECTION_ERRORS = (TimeoutError, ConnectionError, AMQPRecoverableConnectionError, KombuOperationalError,
+                            CeleryTimeoutError)
+try:
+    from redis.exceptions import TimeoutError as RedisTimeoutError, ConnectionError as RedisConnectionError
+except ImportError:
+    pass
+else:
+    BROKER_CONNECTION_ERRORS += (RedisTimeoutError, RedisConnectionError)
 
-def handle_broker_timeout(callable_func, args=(), kwargs=None, timeout=15*60, retry_delay=1, reraise_on_timeout=True):
-    if kwargs is None:
-        kwargs = {}
-    maximum_retry_delay = retry_delay * 10
+
+def handle_broker_timeout(callable_func, args=(), kwargs=None, timeout=15*60, retry_delay=1, reraise_on_timeout=True,
+                          retry_delay_max=None, jitter=True):
+    """Call callable_func, retrying on broker timeouts/connection errors until the timeout expires.
+
+    The delay between tries starts at retry_delay and doubles after every failure, capped at retry_delay_max
+    (defaults to 10x retry_delay). When jitter is set, each sleep is a random fraction (50-100%) of the current
+    delay so that many clients don't hammer a recovering broker in lockstep. Sleeps never extend past the timeout.
+    """
+    if retry_delay_max is None:
+        retry_delay_max = retry_delay * 10
+    delay = retry_delay
     timeout_time = time.monotonic() + timeout if timeout else None
     tries = 0
 
@@ -14,13 +37,8 @@ def handle_broker_timeout(callable_func, args=(), kwargs=None, timeout=15*60, re
         tries += 1
         func_start_time = time.monotonic()
         try:
-            return_value = callable_func(*args, **kwargs)
-        except Exception as e:
-            # need to handle different exceptions from different brokers
-            e_name = type(e).__name__
-            if e_name != "TimeoutError" and e_name != "ConnectionError":
-                raise
-
+            return_value = callable_func(*args, **kwargs) if kwargs else callable_func(*args)
+        except BROKER_CONNECTION_ERRORS as e:
             current_time = time.monotonic()
             if timeout_time is not None and current_time >= timeout_time:
 
@@ -37,26 +55,30 @@ def handle_broker_timeout(callable_func, args=(), kwargs=None, timeout=15*60, re
                     raise
                 return None
 
+            sleep_for = delay * (0.5 + random.random() * 0.5) if jitter else delay
+            if timeout_time is not None:
+                sleep_for = min(sleep_for, timeout_time - current_time)
+
             logger.warning(f'Backend was not reachable... '
-                           f' retrying in {retry_delay}s '
+                           f' retrying in {sleep_for:.2f}s '
                            f'(last call took {(current_time - func_start_time) * 1000:.2f}ms)')
             if timeout_time is not None:
                 logger.warning(f'Final timeout in {timeout_time - current_time}s')
 
-            time.sleep(retry_delay)
+            time.sleep(sleep_for)
             # Exponential backoff
-            retry_delay = retry_delay * 1.1 \
-                if retry_delay * 1.1 < maximum_retry_delay else maximum_retry_delay
+            delay = min(retry_delay_max, delay * 2)
 
         else:
             # callable_func() returned successfully
-            if tries > 1:
-                try:
-                    send_task_instrumentation_event(instrumentation_label='handle_broker_timeout-success',
-                                                    broker_timeout_tries=tries)
-                except Exception as e:
-                    logger.debug('Cannot send instrumentation event', exc_info=e)
+            if tries == 1:
+                return return_value
 
+            try:
+                send_task_instrumentation_event(instrumentation_label='handle_broker_timeout-success',
+                                                broker_timeout_tries=tries)
+            except Exception as e:
+                logger.debug('Cannot send instrumentation event', exc_info=e)
             return return_value
 
 
@@ -65,8 +87,8 @@ def send_task_instrumentation_event(event_type='task-instrumentation', **fields)
     if not current_task:
         return
     try:
-        import traceback
-        current_task.send_event(event_type, instrumentation_event_stack=traceback.format_stack(), **fields)
+        # The innermost frames are enough to identify the caller; formatting the whole stack is costly
+        current_task.send_event(event_type, instrumentation_event_stack=traceback.format_stack(limit=20), **fields)
     except Exception as e:
         logger.debug(e, exc_info=True)
         logger.debug('Could not instrument')
\ No newline at end of file
@@ -79,16 +79,36 @@ def _inject_args_into_signature(sig, **kwargs):
 Signature.injectArgs = _inject_args_into_signature
 
 
+def _is_indirect_arg(value) -> bool:
+    return hasattr(value, 'startswith') and value.startswith(BagOfGoodies.INDIRECT_ARG_CHAR)
+
+
+def _get_verification_key(tasks) -> tuple:
+    # Everything verify_chain_arguments() looks at: the task, how many args are bound, which kwargs are
+    # bound and the values of the reference (@something) kwargs
+    return tuple((task.task,
+                  len(task.args),
+                  tuple((k, v if _is_indirect_arg(v) else None) for k, v in task.kwargs.items()))
+                 for task in tasks)
+
+
 def verify_chain_arguments(sig: Signature):
     """
     Verifies that the chain is not missing any parameters. Asserts if any parameters are missing, or if a
     reference parameter (@something) has not provider
+
+    A successful verification is remembered on the signature, and only redone if the tasks or their
+    arguments have changed since.
     """
     try:
         tasks = sig.tasks
     except AttributeError:
         tasks = [sig]
 
+    verification_key = _get_verification_key(tasks)
+    if getattr(sig, '_fx_verified_key', None) == verification_key:
+        return True
+
     missing = {}
     previous = set()
     ref_args = {}
@@ -125,8 +145,7 @@ def verify_chain_arguments(sig: Signature):
 
         # check for validity of reference values (@ arguments) that are consumed by this microservice
         necessary_args = getfullargspec(undecorate(task_obj)).args
-        new_ref = {k: v[1:] for k, v in task.kwargs.items() if
-                   hasattr(v, 'startswith') and v.startswith(BagOfGoodies.INDIRECT_ARG_CHAR)}
+        new_ref = {k: v[1:] for k, v in task.kwargs.items() if _is_indirect_arg(v)}
         ref_args.update(new_ref)
         for needed in necessary_args:
             if needed in ref_args and ref_args[needed] not in previous:
@@ -146,6 +165,7 @@ def verify_chain_arguments(sig: Signature):
         txt = "\n".join([k + ": " + v for k, v in undefined_indirect.items()])
         raise InvalidChainArgsException('Chain indirectly references the following unavailable parameters: \n%s' %
                                         txt, undefined_indirect)
+    sig._fx_verified_key = verification_key
     return True
 
 
@@ -1,62 +1,96 @@
+import asyncio
 import time
 from typing import Iterable
 
 from celery import current_app
 from celery.utils.log import get_task_logger
 
+from firexkit.broker import BROKER_CONNECTION_ERRORS
+
 logger = get_task_logger(__name__)
 
 
-def inspect_with_retry(inspect_retry_timeout=30, inspect_method=None, retry_if_None_returned=True,
-                       celery_app=current_app, method_args: Iterable = None, verbose=False, **inspect_opts):
+def _get_timeout_time(inspect_retry_timeout):
+    if inspect_retry_timeout and inspect_retry_timeout < 0:
+        raise ValueError(f'inspect_retry_timeout must not be negative, got {inspect_retry_timeout}')
+    return time.monotonic() + (inspect_retry_timeout if inspect_retry_timeout else 0)
 
-    inspect_retry_timeout = inspect_retry_timeout if inspect_retry_timeout else 0
-    timeout_time = time.monotonic() + inspect_retry_timeout
 
-    if method_args is None:
-        method_args = ()
+def _get_result_summary(result):
+    if result:
+        return {k: len(v) for k,v in result.items()}
+    else:
+        return result
 
-    def _get_result_summary(result):
-        if result:
-            return {k: len(v) for k,v in result.items()}
-        else:
-            return result
-
-    def _inspect(celery_app, inspect_method, method_args, **inspect_opts):
-        i = celery_app.control.inspect(**inspect_opts)
-        if inspect_method:
-            header = f'[inspect] app.control.inspect({inspect_opts or ""}).{inspect_method}({method_args or ""})'
-            if verbose:
-                logger.debug(header)
-
-            try:
-                result = getattr(i, inspect_method)(*method_args)
-            except Exception as e:
-                # need to handle different exceptions from different brokers
-                e_name = type(e).__name__
-                if e_name != "TimeoutError" and e_name != "ConnectionError":
-                    raise
-
-                result = None
-                logger.debug(f'Connection error during broker inspection', exc_info=e)
 
-            if verbose:
-                logger.debug(f'{header} returned {_get_result_summary(result)}')
+def _inspect_methods_with_retry(inspector, inspect_methods, timeout_time, retry_if_None_returned, method_args,
+                                verbose, inspect_opts) -> dict:
+    """Call every inspect method on the same Inspect instance, retrying the ones that returned None with a shared
+    deadline and backoff. Returns the results keyed by method name."""
+    # Per method, so that one method succeeding doesn't re-enable the traceback of another that keeps failing
+    broker_errors = {inspect_method: 0 for inspect_method in inspect_methods}
 
-            return result
+    def _inspect(inspect_method):
+        header = f'[inspect] app.control.inspect({inspect_opts or ""}).{inspect_method}({method_args or ""})'
+        if verbose:
+            logger.debug(header)
+
+        try:
+            result = bound_methods[inspect_method](*method_args)
+        except BROKER_CONNECTION_ERRORS as e:
+            result = None
+            broker_errors[inspect_method] += 1
+            # Only log the full traceback once, the broker is likely to keep failing the same way while we retry
+            if broker_errors[inspect_method] == 1:
+                logger.debug(f'Connection error during broker inspection', exc_info=e)
+            else:
+                logger.debug(f'Connection error during broker inspection '
+                             f'(#{broker_errors[inspect_method]}): {e!r}')
         else:
-            header = f'[inspect] app.control.inspect({inspect_opts or ""})'
-            if verbose:
-                logger.debug(header)
+            broker_errors[inspect_method] = 0
+
+        if verbose:
+            logger.debug(f'{header} returned {_get_result_summary(result)}')
+
+        return result
+
+    bound_methods = {inspect_method: getattr(inspector, inspect_method) for inspect_method in inspect_methods}
+    results = {inspect_method: _inspect(inspect_method) for inspect_method in inspect_methods}
+    pending = [inspect_method for inspect_method, result in results.items() if result is None]
+    if not pending or not retry_if_None_returned:
+        return results
+
+    retry_delay = 0.1
+    while pending:
+        now = time.monotonic()
+        if now >= timeout_time:
+            break
+        time.sleep(min(retry_delay, timeout_time - now))
+        # Exponential backoff
+        retry_delay = min(2.0, retry_delay * 1.618)
+        logger.debug(f'[inspect] Retrying {pending} until the deadline')
+        for inspect_method in pending:
+            results[inspect_method] = _inspect(inspect_method)
+        pending = [inspect_method for inspect_method in pending if results[inspect_method] is None]
+    return results
 
-            return i
 
-    inspection_result = _inspect(celery_app, inspect_method, method_args, **inspect_opts)
-    while inspection_result is None and retry_if_None_returned and time.monotonic() < timeout_time:
-        time.sleep(0.1)
-        logger.debug(f'[inspect] Retrying for a maximum of {inspect_retry_timeout}s')
-        inspection_result = _inspect(celery_app, inspect_method, method_args, **inspect_opts)
-    return inspection_result
+def inspect_with_retry(inspect_retry_timeout=30, inspect_method=None, retry_if_None_returned=True,
+                       celery_app=current_app, method_args: Iterable = None, verbose=False, **inspect_opts):
+
+    timeout_time = _get_timeout_time(inspect_retry_timeout)
+    if method_args is None:
+        method_args = ()
+
+    # The Inspect instance is only configuration, it can be shared across retries
+    inspector = celery_app.control.inspect(**inspect_opts)
+    if not inspect_method:
+        if verbose:
+            logger.debug(f'[inspect] app.control.inspect({inspect_opts or ""})')
+        return inspector
+
+    return _inspect_methods_with_retry(inspector, [inspect_method], timeout_time, retry_if_None_returned,
+                                       method_args, verbose, inspect_opts)[inspect_method]
 
 
 def get_active(**kwargs):
@@ -87,3 +121,39 @@ def get_active_queues(**kwargs):
 def get_task(**kwargs):
     kwargs.pop('inspect_method', None)
     return inspect_with_retry(inspect_method='query_task', **kwargs)
+
+
+def get_inspect_bulk(methods=('active', 'reserved', 'scheduled'), inspect_retry_timeout=30,
+                     retry_if_None_returned=True, celery_app=current_app, method_args: Iterable = None,
+                     verbose=False, **inspect_opts) -> dict:
+    """Run several inspect methods on one Inspect instance and return their results keyed by method name.
+
+    The methods share a single inspect_retry_timeout deadline and backoff, so a dead broker costs one retry window
+    rather than one per method. Each method is still a separate broadcast to the workers."""
+    inspect_opts.pop('inspect_method', None)
+    # iterated more than once below
+    methods = tuple(methods)
+    timeout_time = _get_timeout_time(inspect_retry_timeout)
+    if method_args is None:
+        method_args = ()
+
+    inspector = celery_app.control.inspect(**inspect_opts)
+    return _inspect_methods_with_retry(inspector, methods, timeout_time, retry_if_None_returned, method_args,
+                                       verbose, inspect_opts)
+
+
+async def inspect_with_retry_async(**kwargs):
+    """Awaitable inspect_with_retry(); the blocking broker round-trip runs in a worker thread."""
+    # current_app is thread-local, resolve it here rather than in the worker thread
+    kwargs.setdefault('celery_app', current_app._get_current_object())
+    return await asyncio.to_thread(inspect_with_retry, **kwargs)
+
+
+async def get_all_inspect_async(methods=('active', 'reserved', 'scheduled', 'revoked', 'active_queues'), **kwargs):
+    """Run several inspect methods concurrently, each in its own worker thread, and return their results keyed by
+    method name. Unlike get_inspect_bulk(), every method retries with its own inspect_retry_timeout window."""
+    kwargs.pop('inspect_method', None)
+    kwargs.setdefault('celery_app', current_app._get_current_object())
+    results = await asyncio.gather(*[inspect_with_retry_async(inspect_method=method, **kwargs)
+                                     for method in methods])
+    return dict(zip(methods, results))
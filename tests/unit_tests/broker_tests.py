@@ -1,6 +1,8 @@
 import time
 import unittest
 
+from amqp.exceptions import NotAllowed, ConnectionForced
+
 from firexkit.broker import handle_broker_timeout
 
 
@@ -20,15 +22,20 @@ def fail_with_timeout():
     raise TimeoutError()
 
 
+def fail_with_connection_error():
+    raise ConnectionRefusedError()
+
+
 class SucceedAfter():
-    def __init__(self, succeed_after_retries):
+    def __init__(self, succeed_after_retries, exc=TimeoutError):
         self.succeed_after_retries = succeed_after_retries
+        self.exc = exc
         self.tries = 0
 
     def foo(self):
         self.tries += 1
         if self.tries <= self.succeed_after_retries:
-            raise TimeoutError()
+            raise self.exc()
         else:
             return
 
@@ -66,13 +73,56 @@ class HandleBrokerTimeoutTests(unittest.TestCase):
         self.assertGreater(delta, timeout)
         self.assertLess(delta, timeout+(retry_delay*10))  # handle_broker_timeout now uses exponential retry delay
 
+    def test_fail_with_connection_error(self):
+        timeout = 0.5
+        with self.assertRaises(ConnectionRefusedError):
+            start = time.time()
+            handle_broker_timeout(fail_with_connection_error, retry_delay=0.1, timeout=timeout)
+        delta = time.time() - start
+        self.assertGreater(delta, timeout)
+
+    def test_irrecoverable_amqp_error_not_retried(self):
+        obj = SucceedAfter(1, exc=NotAllowed)
+        with self.assertRaises(NotAllowed):
+            handle_broker_timeout(obj.foo, retry_delay=0.1, timeout=1)
+        self.assertEqual(obj.tries, 1)
+
+    def test_recoverable_amqp_error_retried(self):
+        obj = SucceedAfter(1, exc=ConnectionForced)
+        self.assertIsNone(handle_broker_timeout(obj.foo, retry_delay=0.1, timeout=1))
+        self.assertEqual(obj.tries, 2)
+
     def test_succeed_after_retries(self):
+        retry_delay = 0.1
+        succeed_after_retries = 3
+        obj = SucceedAfter(succeed_after_retries)
+        start = time.time()
+        self.assertIsNone(handle_broker_timeout(obj.foo, retry_delay=retry_delay, jitter=False))
+        delta = time.time() - start
+        # delay doubles after every failed try
+        expected_delay = sum(retry_delay * 2**i for i in range(succeed_after_retries))
+        self.assertGreater(delta, expected_delay)
+        self.assertLess(delta, expected_delay+retry_delay)
+
+    def test_succeed_after_retries_with_jitter(self):
         retry_delay = 0.1
         succeed_after_retries = 3
         obj = SucceedAfter(succeed_after_retries)
         start = time.time()
         self.assertIsNone(handle_broker_timeout(obj.foo, retry_delay=retry_delay))
         delta = time.time() - start
+        expected_delay = sum(retry_delay * 2**i for i in range(succeed_after_retries))
+        self.assertGreater(delta, expected_delay/2)
+        self.assertLess(delta, expected_delay+retry_delay)
+
+    def test_retry_delay_max(self):
+        retry_delay = 0.1
+        succeed_after_retries = 3
+        obj = SucceedAfter(succeed_after_retries)
+        start = time.time()
+        self.assertIsNone(handle_broker_timeout(obj.foo, retry_delay=retry_delay, retry_delay_max=retry_delay,
+                                                jitter=False))
+        delta = time.time() - start
         self.assertGreater(delta, succeed_after_retries*retry_delay)
         self.assertLess(delta, (succeed_after_retries+1)*retry_delay)
 
@@ -8,6 +8,8 @@ from firexkit.task import FireXTask, get_attr_unwrapped, DyanmicReturnsNotADict
 from firexkit.chain import ReturnsCodingException, returns, verify_chain_arguments, InvalidChainArgsException, \
     InjectArgs
 from functools import wraps
+from inspect import signature
+from unittest.mock import patch
 
 
 def assertTupleAlmostEqual(t1, t2):
@@ -359,6 +361,39 @@ class ChainVerificationTests(unittest.TestCase):
         c = chain(task1.s(), task2ok.s())
         verify_chain_arguments(c)
 
+    def test_reverify_after_change(self):
+        test_app = Celery()
+
+        @test_app.task(base=FireXTask)
+        def task1():
+            pass  # pragma: no cover
+
+        @test_app.task(base=FireXTask)
+        def task2raise(stuff):
+            assert stuff  # pragma: no cover
+
+        c = chain(task1.s(stuff="yes"), task2raise.s())
+        self.assertTrue(verify_chain_arguments(c))
+        self.assertIsNotNone(getattr(c, '_fx_verified_key', None))
+        # verified chains are remembered, the tasks aren't walked again
+        with patch('firexkit.chain.signature', wraps=signature) as mock_signature:
+            self.assertTrue(verify_chain_arguments(c))
+        mock_signature.assert_not_called()
+
+        # but changes to the chain are taken into account
+        c.tasks[0].kwargs.pop('stuff')
+        with patch('firexkit.chain.signature', wraps=signature) as mock_signature:
+            with self.assertRaises(InvalidChainArgsException):
+                verify_chain_arguments(c)
+        mock_signature.assert_called()
+
+        c.tasks[0].kwargs['stuff'] = 'yes again'
+        self.assertTrue(verify_chain_arguments(c))
+
+        c.tasks[1].kwargs['stuff'] = '@not_there'
+        with self.assertRaises(InvalidChainArgsException):
+            verify_chain_arguments(c)
+
     def test_indirect(self):
         test_app = Celery()
 
@@ -0,0 +1,182 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from firexkit.inspect import inspect_with_retry, inspect_with_retry_async, get_active, get_inspect_bulk, \
+    get_all_inspect_async
+
+
+class FakeInspect:
+    def __init__(self, app):
+        self.app = app
+
+    def active(self):
+        self.app.calls.append('active')
+        time.sleep(self.app.delay)
+        if len(self.app.calls) <= self.app.fail_first:
+            raise TimeoutError()
+        return {'worker': ['task']}
+
+    def reserved(self):
+        self.app.calls.append('reserved')
+        time.sleep(self.app.delay)
+        if self.app.dead:
+            raise TimeoutError()
+        return {'worker': []}
+
+    def scheduled(self):
+        self.app.calls.append('scheduled')
+        time.sleep(self.app.delay)
+        if self.app.dead:
+            raise TimeoutError()
+        return {}
+
+    def revoked(self):
+        self.app.calls.append('revoked')
+        time.sleep(self.app.delay)
+        return {'worker': []}
+
+    def active_queues(self):
+        self.app.calls.append('active_queues')
+        time.sleep(self.app.delay)
+        return {'worker': [{'name': 'celery'}]}
+
+
+class FakeApp:
+    def __init__(self, fail_first=0, dead=False, delay=0):
+        self.fail_first = 100 if dead else fail_first
+        self.dead = dead
+        self.delay = delay
+        self.calls = []
+        self.inspects = 0
+        self.control = self
+
+    def inspect(self, **inspect_opts):
+        self.inspects += 1
+        return FakeInspect(self)
+
+
+class InspectWithRetryTests(unittest.TestCase):
+
+    def test_inspect(self):
+        app = FakeApp()
+        self.assertEqual(get_active(celery_app=app), {'worker': ['task']})
+        self.assertEqual(app.calls, ['active'])
+
+    def test_no_method_returns_inspector(self):
+        self.assertIsInstance(inspect_with_retry(celery_app=FakeApp()), FakeInspect)
+
+    def test_retry_on_broker_error(self):
+        app = FakeApp(fail_first=3)
+        start = time.monotonic()
+        self.assertEqual(get_active(celery_app=app), {'worker': ['task']})
+        delta = time.monotonic() - start
+        self.assertEqual(len(app.calls), 4)
+        # the inspector is only built once
+        self.assertEqual(app.inspects, 1)
+        # 0.1s, growing exponentially between tries
+        self.assertGreater(delta, 0.3)
+        self.assertLess(delta, 1)
+
+    def test_retry_timeout(self):
+        app = FakeApp(fail_first=100)
+        start = time.monotonic()
+        self.assertIsNone(get_active(celery_app=app, inspect_retry_timeout=0.5))
+        delta = time.monotonic() - start
+        self.assertGreaterEqual(delta, 0.5)
+        self.assertLess(delta, 0.6)
+
+    def test_traceback_logged_once_per_call(self):
+        app = FakeApp(fail_first=3)
+        with self.assertLogs('firexkit.inspect', level='DEBUG') as logs:
+            get_active(celery_app=app)
+        errors = [r for r in logs.records if r.getMessage().startswith('Connection error')]
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(len([r for r in errors if r.exc_info]), 1)
+
+        # every call logs its own first failure
+        app.calls, app.fail_first = [], 1
+        with self.assertLogs('firexkit.inspect', level='DEBUG') as logs:
+            get_active(celery_app=app)
+        self.assertTrue(any(r.exc_info for r in logs.records))
+
+    def test_traceback_logged_once_per_method(self):
+        app = FakeApp(fail_first=3)
+        with self.assertLogs('firexkit.inspect', level='DEBUG') as logs:
+            get_inspect_bulk(methods=('active', 'reserved'), celery_app=app)
+        errors = [r for r in logs.records if r.getMessage().startswith('Connection error')]
+        self.assertEqual(len(errors), 2)
+        # reserved succeeding in between doesn't bring back the traceback for active
+        self.assertEqual(len([r for r in errors if r.exc_info]), 1)
+
+    def test_no_retry_timeout(self):
+        for inspect_retry_timeout in [0, None]:
+            with self.subTest(inspect_retry_timeout=inspect_retry_timeout):
+                app = FakeApp(fail_first=1)
+                self.assertIsNone(get_active(celery_app=app, inspect_retry_timeout=inspect_retry_timeout))
+                self.assertEqual(len(app.calls), 1)
+
+    def test_negative_retry_timeout(self):
+        with self.assertRaises(ValueError):
+            get_active(celery_app=FakeApp(), inspect_retry_timeout=-1)
+
+    def test_no_retry(self):
+        app = FakeApp(fail_first=1)
+        self.assertIsNone(get_active(celery_app=app, retry_if_None_returned=False))
+        self.assertEqual(len(app.calls), 1)
+
+    def test_get_inspect_bulk(self):
+        self.assertDictEqual(get_inspect_bulk(celery_app=FakeApp()),
+                             {'active': {'worker': ['task']}, 'reserved': {'worker': []}, 'scheduled': {}})
+
+    def test_get_inspect_bulk_methods_iterator(self):
+        self.assertDictEqual(get_inspect_bulk(methods=iter(['active', 'reserved']), celery_app=FakeApp()),
+                             {'active': {'worker': ['task']}, 'reserved': {'worker': []}})
+
+    def test_get_inspect_bulk_retries(self):
+        app = FakeApp(fail_first=1)
+        self.assertDictEqual(get_inspect_bulk(celery_app=app), {'active': {'worker': ['task']},
+                                                                'reserved': {'worker': []},
+                                                                'scheduled': {}})
+        self.assertEqual(app.inspects, 1)
+        # only the failed method is retried
+        self.assertEqual(app.calls, ['active', 'reserved', 'scheduled', 'active'])
+
+    def test_get_inspect_bulk_shares_deadline(self):
+        app = FakeApp(dead=True)
+        start = time.monotonic()
+        self.assertDictEqual(get_inspect_bulk(celery_app=app, inspect_retry_timeout=0.5),
+                             {'active': None, 'reserved': None, 'scheduled': None})
+        delta = time.monotonic() - start
+        self.assertGreaterEqual(delta, 0.5)
+        self.assertLess(delta, 0.6)
+
+
+class InspectAsyncTests(unittest.TestCase):
+
+    def test_inspect_with_retry_async(self):
+        result = asyncio.run(inspect_with_retry_async(inspect_method='active', celery_app=FakeApp()))
+        self.assertEqual(result, {'worker': ['task']})
+
+    def test_current_app_resolved_in_caller_thread(self):
+        app = FakeApp()
+        with patch('firexkit.inspect.current_app') as current_app:
+            current_app._get_current_object.return_value = app
+            result = asyncio.run(inspect_with_retry_async(inspect_method='active'))
+        self.assertEqual(result, {'worker': ['task']})
+        self.assertEqual(app.calls, ['active'])
+
+    def test_get_all_inspect_async(self):
+        delay = 0.3
+        app = FakeApp(delay=delay)
+        start = time.monotonic()
+        result = asyncio.run(get_all_inspect_async(celery_app=app))
+        delta = time.monotonic() - start
+        self.assertDictEqual(result, {'active': {'worker': ['task']},
+                                      'reserved': {'worker': []},
+                                      'scheduled': {},
+                                      'revoked': {'worker': []},
+                                      'active_queues': {'worker': [{'name': 'celery'}]}})
+        # the five inspections overlap instead of running one after another
+        self.assertLess(delta, 2*delay)